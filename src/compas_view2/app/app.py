@@ -10,16 +10,17 @@ from typing_extensions import Literal
 
 import sys
 import os
-import json
+import copy
 import tempfile
 import shutil
 
+from collections import deque
 from functools import partial
+from functools import lru_cache
 
 from qtpy import QtCore
 from qtpy import QtGui
 from qtpy import QtWidgets
-from qtpy.QtGui import QIcon
 
 from compas.data import Data
 from compas.colors import Color
@@ -45,6 +46,11 @@ try:
 except ImportError:
     Flow = None
 
+try:
+    from orjson import loads as _loads
+except ImportError:
+    from json import loads as _loads
+
 from .timer import Timer
 from .selector import Selector
 from .controller import Controller
@@ -53,8 +59,37 @@ from .plot import MplCanvas
 
 HERE = os.path.dirname(__file__)
 ICONS = os.path.join(HERE, "../icons")
+CONFIG = os.path.join(HERE, "config_default.json")
+
+VERSIONS = {
+    "120": ((2, 1), View120, QtGui.QSurfaceFormat.CompatibilityProfile),
+    "330": ((3, 3), View330, QtGui.QSurfaceFormat.CoreProfile),
+}
+
+
+def _read_json(path):
+    """Parse a JSON file, with orjson if it is available."""
+    with open(path, "rb") as f:
+        return _loads(f.read())
+
 
-VERSIONS = {"120": (2, 1), "330": (3, 3)}
+@lru_cache(maxsize=1)
+def _load_config():
+    """Load the default configuration file, once per process.
+
+    The returned dict is shared and should not be modified.
+    """
+    return _read_json(CONFIG)
+
+
+@lru_cache(maxsize=None)
+def _icon(name):
+    """Load an icon from the icons folder of the package, once per process and per name.
+
+    The icons are read from disk on first use rather than from a compiled Qt resource bundle,
+    such that adding an icon does not require regenerating a resource module with ``rcc``.
+    """
+    return QtGui.QIcon(os.path.join(ICONS, name))
 
 
 class App:
@@ -95,13 +130,13 @@ class App:
         such as the menu, toolbar, statusbar, ...
     view : :class:`compas_view2.View`
         Instance of OpenGL view.
-        This view is the central widget of the main window.
+        This view is embedded in the central widget of the main window with a window container.
     controller : :class:`compas_view2.app.Controller`
         The action controller of the app.
 
     Notes
     -----
-    The app has a (main) window with a central OpenGL widget (i.e. the 'view'),
+    The app has a (main) window with a central OpenGL window (i.e. the 'view'),
     and a menubar, toolbar, and statusbar.
     The menubar provides access to all supported 'actions'.
     The toolbar is meant to be a 'quicknav' to a selected set of actions.
@@ -121,6 +156,10 @@ class App:
     All added COMPAS objects are wrapped in a viewer object and stored in a dictionary,
     mapping the object's ID (``id(object)``) to the instance.
 
+    The attributes of the app are declared in ``__slots__``,
+    therefore no other attributes can be set on an app instance.
+    Subclasses of the app that do not declare ``__slots__`` themselves can still set any attribute.
+
     Examples
     --------
     >>> from compas_view2 import app
@@ -129,6 +168,37 @@ class App:
 
     """
 
+    __slots__ = (
+        "config",
+        "all_config",
+        "version",
+        "title",
+        "timer",
+        "timers",
+        "_pending_init",
+        "width",
+        "height",
+        "window",
+        "view",
+        "controller",
+        "_app",
+        "_screen_geom",
+        "selector",
+        "flow",
+        "dock_slots",
+        "started",
+        "on_object_selected",
+        "statusbar",
+        "statusText",
+        "statusFps",
+        "menubar",
+        "toolbar",
+        "sidebar",
+        "sidedock1",
+        "sidedock2",
+        "__weakref__",
+    )
+
     def __init__(
         self,
         title: str = None,
@@ -151,14 +221,13 @@ class App:
         controller_class: Optional[Controller] = None,
     ):
         # Initialize the config.
+        # The app modifies its config, therefore it gets its own copy of the cached default.
 
-        with open(os.path.join(HERE, "config_default.json")) as f:
-            DEFAULT_CONFIG = json.load(f)
+        DEFAULT_CONFIG = copy.deepcopy(_load_config())
 
         if config is not None:
             if not isinstance(config, dict):
-                with open(config) as f:
-                    config = json.load(f)
+                config = _read_json(config)
 
             for key in DEFAULT_CONFIG:
                 if key not in config:
@@ -211,19 +280,12 @@ class App:
         self.version = self.config["version"]
 
         if self.version not in VERSIONS:
-            raise Exception("Only these versions are currently supported: {}".format(VERSIONS))
+            raise Exception("Only these versions are currently supported: {}".format(list(VERSIONS)))
 
+        gl_version, View, profile = VERSIONS[self.version]
         glFormat = QtGui.QSurfaceFormat()
-        glFormat.setVersion(*VERSIONS[self.version])
-
-        if self.version == "330":
-            View = View330
-            glFormat.setProfile(QtGui.QSurfaceFormat.CoreProfile)
-        elif self.version == "120":
-            View = View120
-            glFormat.setProfile(QtGui.QSurfaceFormat.CompatibilityProfile)
-        else:
-            raise NotImplementedError
+        glFormat.setVersion(*gl_version)
+        glFormat.setProfile(profile)
 
         glFormat.setDefaultFormat(glFormat)
         QtGui.QSurfaceFormat.setDefaultFormat(glFormat)
@@ -233,27 +295,29 @@ class App:
             app = QtWidgets.QApplication(sys.argv)
         app.references = set()
 
-        appIcon = QIcon(os.path.join(ICONS, "compas_icon_white.png"))
+        appIcon = _icon("compas_icon_white.png")
         app.setWindowIcon(appIcon)
         self.title = self.config["title"]
         app.setApplicationName(self.title)
 
         self.timer = None
-        self.frame_count = 0
-        self.record = False
-        self.recorded_frames = []
+        self.timers = []
+        self._pending_init = []
 
         self.width = self.config["width"]
         self.height = self.config["height"]
         self.window = QtWidgets.QMainWindow()
         self.view = View(self, config["view"])
-        self.window.setCentralWidget(self.view)
+        container = QtWidgets.QWidget.createWindowContainer(self.view, self.window)
+        container.setFocusPolicy(QtCore.Qt.StrongFocus)
+        self.window.setCentralWidget(container)
         self.window.setContentsMargins(0, 0, 0, 0)
 
         controller_class = controller_class or Controller
         self.controller = controller_class(self, controller_config=config["controller"])
         self._app = app
         self._app.references.add(self.window)
+        self._screen_geom = QtGui.QGuiApplication.primaryScreen().availableGeometry()
         self.selector = Selector(self)
 
         if Flow:
@@ -303,12 +367,16 @@ class App:
         -------
         None
 
+        Notes
+        -----
+        The window is centered on the available geometry of the primary screen,
+        which is queried once, when the app is created.
+
         """
         self.window.resize(width, height)
-        desktop = self._app.desktop()
-        rect = desktop.availableGeometry()
-        x = 0.5 * (rect.width() - width)
-        y = 0.5 * (rect.height() - height)
+        rect = self._screen_geom
+        x = int(0.5 * (rect.width() - width))
+        y = int(0.5 * (rect.height() - height))
         self.window.setGeometry(x, y, width, height)
 
     def add(
@@ -375,6 +443,11 @@ class App:
         :class:`compas_view2.objects.Object`
             The added object.
 
+        Notes
+        -----
+        If the view is already initialized, the buffers of the object are not created immediately,
+        but on the next iteration of the event loop, together with those of all other objects added in the meantime.
+
         """
         if name is not None:
             kwargs["name"] = name
@@ -403,12 +476,10 @@ class App:
 
         obj = Object.build(data, app=self, **kwargs)
 
-        self.view.objects[obj] = obj
         self.selector.add(obj)
+        self.view.add_object(obj)
         if self.view.isValid():
-            obj.init()
-            if self.dock_slots["sceneform"]:
-                self.dock_slots["sceneform"].update()
+            self._schedule_init(obj)
         return obj
 
     def add_reference(self, obj: Object, **kwargs) -> Object:
@@ -427,12 +498,50 @@ class App:
 
         """
         ref = obj.otype.from_other(obj, **kwargs)
-        self.view.objects[ref] = ref
         self.selector.add(ref)
+        self.view.add_object(ref)
         if self.view.isValid():
-            ref.init()
+            self._schedule_init(ref)
         return ref
 
+    def _schedule_init(self, obj: Object) -> None:
+        if not self._pending_init:
+            QtCore.QTimer.singleShot(0, self._flush_init)
+        obj._init_pending = True
+        self._pending_init.append(obj)
+
+    def _flush_init(self, update_view: bool = True) -> None:
+        """Initialize all objects that were added since the last flush in one go.
+
+        Parameters
+        ----------
+        update_view : bool, optional
+            If True, schedule a repaint of the view after the initialization.
+
+        Returns
+        -------
+        None
+
+        Notes
+        -----
+        The GL context is made current once for all objects,
+        and the scene form and the view are updated once afterwards.
+        The view also flushes the pending objects before painting, without scheduling another repaint.
+
+        """
+        objects, self._pending_init = self._pending_init, []
+        objects = [obj for obj in objects if obj._init_pending]
+        if not objects:
+            return
+        self.view.makeCurrent()
+        for obj in objects:
+            obj._init_pending = False
+            obj.init()
+        if self.dock_slots["sceneform"]:
+            self.dock_slots["sceneform"].update()
+        if update_view:
+            self.view.update()
+
     def remove(self, obj: Object) -> None:
         """Remove an object from the view.
 
@@ -446,11 +555,9 @@ class App:
         None
 
         """
-        if obj in list(self.view.objects):
-            del self.view.objects[obj]
-        for key, value in list(self.selector.instances.items()):
-            if obj == value:
-                del self.selector.instances[key]
+        self.view.remove_object(obj)
+        self.selector.remove(obj)
+        obj._init_pending = False
 
     def show(self) -> None:
         """Show the viewer window.
@@ -468,7 +575,6 @@ class App:
         if self.dock_slots["sceneform"]:
             self.dock_slots["sceneform"].update()
 
-        self.selector.start_monitor_instance_map()
         self._app.exec_()
 
     run = show
@@ -804,7 +910,7 @@ class App:
     # ==============================================================================
 
     def _get_icon(self, icon: str):
-        return QtGui.QIcon(os.path.join(ICONS, icon))
+        return _icon(icon)
 
     def _init_statusbar(self, statusbar_config: Dict):
         self.statusbar = self.window.statusBar()
@@ -858,26 +964,42 @@ class App:
     def _add_menubar_items(self, items: List[Dict], parent: QtWidgets.QWidget):
         if not items:
             return
-        for item in items:
-            if item["type"] == "separator":
-                parent.addSeparator()
-            elif item["type"] == "menu":
-                menu = parent.addMenu(item["text"])
-                if "items" in item:
-                    self._add_menubar_items(item["items"], menu)
-            elif item["type"] == "radio":
-                radio = QtWidgets.QActionGroup(self.window)
-                radio.setExclusive(True)
-                for item in item["items"]:
-                    action = self._add_action(parent, text=item["text"], action=item["action"])
-                    action.setCheckable(True)
-                    action.setChecked(item["checked"])
-                    radio.addAction(action)
-            elif item["type"] == "action":
-                del item["type"]
-                self._add_action(parent, text=item["text"], action=item["action"])
-            else:
-                raise NotImplementedError
+        queue = deque([(items, parent)])
+        while queue:
+            items, parent = queue.popleft()
+            for item in items:
+                name = self._MENUBAR_HANDLERS.get(item["type"])
+                if name is None:
+                    raise NotImplementedError
+                # look up the handler by name, such that subclasses can override it
+                getattr(self, name)(item, parent, queue)
+
+    def _add_menubar_separator(self, item: Dict, parent: QtWidgets.QWidget, queue: deque):
+        parent.addSeparator()
+
+    def _add_menubar_menu(self, item: Dict, parent: QtWidgets.QWidget, queue: deque):
+        menu = parent.addMenu(item["text"])
+        if "items" in item:
+            queue.append((item["items"], menu))
+
+    def _add_menubar_radio(self, item: Dict, parent: QtWidgets.QWidget, queue: deque):
+        radio = QtWidgets.QActionGroup(self.window)
+        radio.setExclusive(True)
+        for option in item["items"]:
+            action = self._add_action(parent, text=option["text"], action=option["action"])
+            action.setCheckable(True)
+            action.setChecked(option["checked"])
+            radio.addAction(action)
+
+    def _add_menubar_action(self, item: Dict, parent: QtWidgets.QWidget, queue: deque):
+        self._add_action(parent, text=item["text"], action=item["action"])
+
+    _MENUBAR_HANDLERS = {
+        "separator": "_add_menubar_separator",
+        "menu": "_add_menubar_menu",
+        "radio": "_add_menubar_radio",
+        "action": "_add_menubar_action",
+    }
 
     def _add_toolbar_items(self, items: List[Dict], parent: QtWidgets.QWidget):
         if not items:
@@ -930,11 +1052,13 @@ class App:
 
         args = args or []
         kwargs = kwargs or {}
+        # only bind arguments if there are any, to avoid an extra call layer when the action is triggered
+        callback = partial(action, *args, **kwargs) if args or kwargs else action
         if icon:
             icon = self._get_icon(icon)
-            action = parent.addAction(icon, text, partial(action, *args, **kwargs))
+            action = parent.addAction(icon, text, callback)
         else:
-            action = parent.addAction(text, partial(action, *args, **kwargs))
+            action = parent.addAction(text, callback)
         return action
 
     # ==============================================================================
@@ -1170,41 +1294,50 @@ class App:
             raise ValueError("Must specify either interval or timeout")
 
         if record:
-            # check if record_path is writable
-            # create temp dir for frames
-            self.tempdir = tempfile.mkdtemp()
-            record_fps = record_fps or 1000 / interval
+            record_fps = record_fps or 1000 / (interval or timeout)
 
         def outer(func: Callable):
+            # every callback has its own frame counter and recording
+            frame_count = 0
+            tempdir = tempfile.mkdtemp() if record else None
+
+            def save_recording():
+                files = [os.path.join(tempdir, f"{i}.png") for i in range(frames)]
+                gif_from_images(
+                    files=files,
+                    gif_path=record_path,
+                    fps=record_fps,
+                    delete_files=True,
+                )
+                shutil.rmtree(tempdir)
+                print("Recorded to ", record_path)
+
             def render():
-                func(self.frame_count)
+                nonlocal frame_count
+                func(frame_count)
+                frame_count += 1
+                done = frames is not None and frame_count >= frames
+                if record:
+                    # the frame is captured by the paint that follows this update
+                    self.view.capture(
+                        os.path.join(tempdir, f"{frame_count - 1}.png"),
+                        "png",
+                        callback=save_recording if done else None,
+                    )
                 self.view.update()
-                self.frame_count += 1
-                if frames is not None and self.frame_count >= frames:
-                    self.timer.stop()
-                    if self.record:
-                        self.record = False
-                        # self.recorded_frames[0].save(
-                        #     record_path, save_all=True, optimize=False,
-                        #     duration=playback_interval or interval,
-                        #     append_images=self.recorded_frames[1:],
-                        #     loop=100)
-                        files = [os.path.join(self.tempdir, f"{i}.png") for i in range(frames)]
-                        gif_from_images(
-                            files=files,
-                            gif_path=record_path,
-                            fps=record_fps,
-                            delete_files=True,
-                        )
-                        shutil.rmtree(self.tempdir)
-                        print("Recorded to ", record_path)
+                if done:
+                    timer.stop()
+                elif timeout:
+                    # restart the single-shot timer only after the previous call has completed
+                    timer.start()
 
             if interval:
-                self.timer = Timer(interval=interval, callback=render)
+                timer = Timer(interval=interval, callback=render, parent=self.window)
             if timeout:
-                self.timer = Timer(interval=timeout, callback=render, singleshot=True)
-
-            self.frame_count = 0
-            self.record = record
+                timer = Timer(interval=timeout, callback=render, singleshot=True, parent=self.window)
+            # keep a reference to every timer, such that none of them is garbage collected
+            self.timers.append(timer)
+            self.timer = timer
+            return func
 
         return outer
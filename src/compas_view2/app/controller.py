@@ -407,6 +407,11 @@ class Controller:
         -------
         None
 
+        Notes
+        -----
+        The screenshot is saved by the view right after it has painted its next frame,
+        see :meth:`compas_view2.views.View.capture`.
+
         """
         for key in self.keys["view_capture"]:
             self.key_status[key] = False
@@ -420,8 +425,7 @@ class Controller:
         filepath = Path(result)
         if not filepath.suffix:
             return
-        qimage = self.app.view.grabFramebuffer()
-        qimage.save(str(filepath), filepath.suffix[1:])
+        self.app.view.capture(str(filepath), filepath.suffix[1:])
 
     def view_front(self):
         """Swtich to a front view.
@@ -539,7 +543,7 @@ class Controller:
             if self.app.selector.wait_for_selection_on_plane:
                 self.app.selector.finish_selection_on_plane(event.pos().x(), event.pos().y())
             else:
-                self.app.selector.enabled = True
+                self.app.selector.request_pick(event.pos().x(), event.pos().y())
 
         QtWidgets.QApplication.restoreOverrideCursor()
 
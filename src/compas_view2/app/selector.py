@@ -1,8 +1,20 @@
 import time
-from random import randint
+import math
 import numpy as np
 
-from .worker import Ticker
+from qtpy import QtCore
+
+from compas_view2.gl import delete_buffers
+from compas_view2.gl import make_index_buffer
+from compas_view2.gl import make_pick_framebuffer
+from compas_view2.gl import make_pixel_pack_buffer
+from compas_view2.gl import make_vertex_buffer
+from compas_view2.gl import read_pixel_pack_buffer
+
+
+def rgb_to_pick_id(rgb):
+    """Decode a pixel color of the instance map into a pick ID."""
+    return int(rgb[0]) | int(rgb[1]) << 8 | int(rgb[2]) << 16
 
 
 class Selector:
@@ -25,20 +37,12 @@ class Selector:
         Selectable types.
     select_from : "pixel" | "box"
         The selection mechanism.
-    enabled : bool
-        Flag indicating to the view that an instance map should be drawn.
     wait_for_selection : bool
         Flag indicating to wait for the interatice selection to finish
     wait_for_selection_on_plane : bool
         Flag indicating to wait for the user to pick a location on plane
     snap_to_grid : bool
         Turn grid snap on or off.
-    colors_to_exclude : list[tuple[int, int, int]]
-        The instance colors to exclude from the selection process.
-    instances : dict
-        Mapping between pixel colors and scene objects.
-    instance_map : np.array with shape (?,?,3)
-        The painted instance map as np array
     box_select_coords : list of 4 floats
         The 2D box selection coordinates on view window: [minX, minY, maxX, maxY]
     location_on_plane :
@@ -46,8 +50,33 @@ class Selector:
     selected : list of instances
         The instances that are selected
 
+    Notes
+    -----
+    Pick requests are coalesced, such that at most one pick is performed every ``pick_interval`` milliseconds,
+    using the latest requested mouse position.
+
+    A pixel pick paints a square region around the mouse, as large as the largest point size or line width,
+    but at most ``pick_size`` pixels, and reads back its center pixel.
+
+    Pixel picks are read back asynchronously into a pixel pack buffer,
+    and resolved when the view paints its next frame.
+    This avoids stalling the GL pipeline at the cost of one frame of latency.
+
+    For picking, the geometry of all visible pickable objects is merged into shared buffers
+    per primitive type and size, with the instance colors as vertex attribute,
+    such that a pick only requires a few draw calls, regardless of the number of objects.
+
+    Every object is assigned a dense integer pick ID, starting from 1.
+    The pick ID is encoded in the RGB channels of the instance map (R holding the lowest byte),
+    such that a pixel color is decoded to an object by a single list lookup.
+    The color black (pick ID 0) denotes the background.
+    The merged buffers are only rebuilt when the pickable geometry changes.
+
     """
 
+    pick_interval = 100
+    pick_size = 65
+
     def __init__(self, app):
         self.app = app
         # Selector options
@@ -56,23 +85,26 @@ class Selector:
         self.types = []
         self.select_from = "pixel"  # or "box"
         # Selector state flags
-        self.enabled = False
         self.wait_for_selection = False
         self.wait_for_selection_on_plane = False
         self.snap_to_grid = False
         # Selector data
-        self.colors_to_exclude = [
-            (
-                0,
-                0,
-                0,
-            ),
-            (255, 255, 255),
-        ]
-        self.instances = {}
-        self.instance_map = None
         self.box_select_coords = np.zeros((4,), int)
         self.location_on_plane = None
+        # Selector GL resources
+        self._pick_fbo = None
+        self._pick_pbo = None
+        self._pending_pbo = None
+        self._id_to_obj = []
+        self._pickable = []
+        self._batches = {}
+        self._batches_key = None
+        self._batches_refs = []
+        self._pick_position = None
+        self._pick_timer = QtCore.QTimer()
+        self._pick_timer.setSingleShot(True)
+        self._pick_timer.setInterval(self.pick_interval)
+        self._pick_timer.timeout.connect(self._do_pick)
 
     # -------------------------------------------------------------------------
     # properties
@@ -80,12 +112,28 @@ class Selector:
 
     @property
     def selected(self):
-        return [self.instances[key] for key in self.instances if self.instances[key].is_selected]
+        return [obj for obj in self._id_to_obj if obj is not None and obj.is_selected]
 
     # -------------------------------------------------------------------------
     # methods
     # -------------------------------------------------------------------------
 
+    def init(self):
+        """Initialize the GL resources of the selector.
+
+        Returns
+        -------
+        None
+
+        Notes
+        -----
+        This requires a current GL context,
+        and is therefore called by the view during the initialization of the OpenGL canvas.
+
+        """
+        self._pick_fbo = make_pick_framebuffer(self.pick_size, self.pick_size)
+        self._pick_pbo = make_pixel_pack_buffer(4)
+
     def reset(self):
         """Reset the selector state.
 
@@ -98,7 +146,6 @@ class Selector:
         self.overwrite_mode = None
         self.types = []
         self.select_from = "pixel"
-        self.enabled = False
         self.box_select_coords = np.zeros((4,), int)
         self.wait_for_selection = False
         self.wait_for_selection_on_plane = False
@@ -106,69 +153,235 @@ class Selector:
         self.snap_to_grid = False
         self.deselect()
 
-    def start_monitor_instance_map(self):
-        """This function triggers a monitor loop to watch the instance map attribute,
-        Once an instance map is painted, the actual selection operation is triggered here.
+    def request_pick(self, x, y):
+        """Request a pick at the given mouse position.
+
+        Parameters
+        ----------
+        x : int
+            x coordinate of the mouse
+        y : int
+            y coordinate of the mouse
 
         Returns
         -------
         None
 
+        Notes
+        -----
+        The pick is not performed immediately, but when the pick timer times out.
+        Requests that arrive in the meantime only update the position of the pending pick.
+
         """
+        self._pick_position = x, y
+        if not self._pick_timer.isActive():
+            self._pick_timer.start()
+
+    def _do_pick(self):
+        if self._pick_position is None:
+            return
+        x, y = self._pick_position
+        self._pick_position = None
+        self.pick(x, y)
+
+    def pick(self, x, y):
+        """Pick objects from the current view, and update the selection accordingly.
+
+        Parameters
+        ----------
+        x : int
+            x coordinate of the mouse
+        y : int
+            y coordinate of the mouse
+
+        Returns
+        -------
+        None
+
+        Notes
+        -----
+        Selection is a low-frequency event.
+        Therefore, the instance maps are not painted as part of the regular paint loop of the view,
+        but only when a pick is requested, using a minimal pass over the pickable objects.
+
+        Nothing is picked if the GL resources of the selector have not been initialized by the view.
+
+        """
+        if self._pick_fbo is None:
+            return
+        view = self.app.view
+        view.makeCurrent()
+        self._update_batches()
+        if self.select_from == "box":
+            # Pick objects from box selection
+            instance_map = view.paint_instances(self.box_select_coords)
+            self.select_all_from_instance_map(instance_map)
+            self.select_from = "pixel"
+            view.update()
+            self._on_selection_changed()
+        else:
+            # Pick an object from the single pixel rendered under the mouse,
+            # the result is resolved in the next frame
+            view.paint_pick(x, y, self._pick_pbo, self._pick_region_size())
+            self._pending_pbo = self._pick_pbo
+            view.update()
+
+    def resolve_pick(self):
+        """Resolve the pending pixel pick, if any.
+
+        Returns
+        -------
+        None
+
+        Notes
+        -----
+        This requires a current GL context, and is therefore called by the view at the start of every paint.
+        The selection is updated immediately,
+        but the notification of the forms and callbacks is deferred until after the paint.
 
-        def select():
-            if self.instance_map is not None:
-                instance_map = self.instance_map
-                if self.select_from == "pixel":
-                    # Pick an object from mouse pixel
-                    x = self.app.controller.mouse.last_pos.x()
-                    y = self.app.controller.mouse.last_pos.y()
-                    self.select_one_from_instance_map(x, y, instance_map)
-                if self.select_from == "box":
-                    # Pick objects from box selection
-                    self.select_all_from_instance_map(instance_map)
-                    self.select_from = "pixel"
-                self.app.view.update()
-                self.instance_map = None
-
-                if self.app.dock_slots["propertyform"] is not None and self.selected:
-                    self.app.dock_slots["propertyform"].set_object(self.selected[0])
-                if self.app.dock_slots["sceneform"] is not None:
-                    self.app.dock_slots["sceneform"].select(self.selected)
-                for func in self.app.on_object_selected:
-                    func(self.selected)
-
-        # Start monitor loop in a separate worker thread
-        ticker = Ticker(interval=0.02)
-        ticker.signals.tick.connect(select)
-        Ticker.pool.start(ticker)
-
-        self.app._app.aboutToQuit.connect(ticker.stop)
-
-    def get_rgb_key(self):
         """
+        if self._pending_pbo is None:
+            return
+        data = read_pixel_pack_buffer(self._pending_pbo, 4)
+        self._pending_pbo = None
+        instance_map = np.frombuffer(data, dtype=np.uint8)[:3].reshape(1, 1, 3)
+        self.select_one_from_instance_map(0, 0, instance_map)
+        QtCore.QTimer.singleShot(0, self._on_selection_changed)
+
+    def _pick_region_size(self):
+        """The odd number of pixels along the sides of the region that is painted for a pixel pick."""
+        size = max((size for mode, size in self._batches if mode != "triangles"), default=1)
+        size = 2 * int(math.ceil(size / 2)) + 1
+        return min(size, self.pick_size)
+
+    def _update_batches(self):
+        self.app.view.update_transforms()
+        wireframe = self.app.view.mode == "wireframe"
+        key = [wireframe]
+        refs = []
+        for obj in self._pickable:
+            if not obj.is_visible:
+                continue
+            key.append((obj._pick_id, id(obj._matrix_buffer)))
+            refs.append(obj._matrix_buffer)
+            for mode, size, buffer in obj._instance_buffers(wireframe):
+                key.append((mode, size, id(buffer["position_array"]), id(buffer["element_array"])))
+                refs.append(buffer["position_array"])
+                refs.append(buffer["element_array"])
+        key = tuple(key)
+        if key != self._batches_key:
+            self._rebuild_batches(wireframe)
+            self._batches_key = key
+            # keep the keyed arrays alive, such that their ids cannot be reused while the batches are current
+            self._batches_refs = refs
+
+    def _rebuild_batches(self, wireframe=False):
+        """Merge the geometry of all visible pickable objects into shared buffers per primitive type and size.
+
+        Parameters
+        ----------
+        wireframe : bool, optional
+            Whether the view is in wireframe mode.
+
         Returns
         -------
-        rgb_key
-            a tuple of rgb color value in integer
+        None
+
+        Notes
+        -----
+        This requires a current GL context.
+        The positions are transformed to world coordinates,
+        and the pick ID of each object is stored per vertex.
+
         """
-        while True:
-            rgb_key = (randint(0, 255), randint(0, 255), randint(0, 255))
-            if rgb_key not in self.instances and rgb_key not in self.colors_to_exclude:
-                return rgb_key
+        for batch in self._batches.values():
+            delete_buffers([batch["positions"], batch["pick_ids"], batch["elements"]])
+        groups = {}
+        transforms = self.app.view._transforms
+        pick_ids = self.app.view._pick_ids
+        for obj in self._pickable:
+            if not obj.is_visible or obj._view_index is None:
+                continue
+            matrix = None if obj._matrix_buffer is None else transforms[obj._view_index]
+            pick_id = pick_ids[obj._view_index]
+            for mode, size, buffer in obj._instance_buffers(wireframe):
+                positions = buffer["position_array"]
+                if not len(positions) or not len(buffer["element_array"]):
+                    continue
+                if matrix is not None:
+                    positions = positions @ matrix[:3, :3].T + matrix[:3, 3]
+                group = groups.setdefault((mode, size), {"positions": [], "pick_ids": [], "elements": [], "count": 0})
+                group["positions"].append(positions)
+                group["pick_ids"].append(np.full(len(positions), pick_id, dtype=np.float32))
+                group["elements"].append(buffer["element_array"] + group["count"])
+                group["count"] += len(positions)
+        self._batches = {}
+        for (mode, size), group in groups.items():
+            elements = np.concatenate(group["elements"])
+            self._batches[mode, size] = {
+                "positions": make_vertex_buffer(np.concatenate(group["positions"])),
+                "pick_ids": make_vertex_buffer(np.concatenate(group["pick_ids"])),
+                "elements": make_index_buffer(elements),
+                "n": len(elements),
+            }
+
+    def _on_selection_changed(self):
+        if self.app.dock_slots["propertyform"] is not None and self.selected:
+            self.app.dock_slots["propertyform"].set_object(self.selected[0])
+        if self.app.dock_slots["sceneform"] is not None:
+            self.app.dock_slots["sceneform"].select(self.selected)
+        for func in self.app.on_object_selected:
+            func(self.selected)
 
     def add(self, obj):
-        """Add an object to the list of selector instances, each object will be assigned a unique hex color key
+        """Add an object to the list of selector instances, each object will be assigned a unique pick ID
+
+        Returns
+        -------
+        int
+            the pick ID of the object
+        """
+        self._id_to_obj.append(obj)
+        obj._pick_id = len(self._id_to_obj)
+        if hasattr(obj, "_instance_buffers"):
+            self._pickable.append(obj)
+        return obj._pick_id
+
+    def remove(self, obj):
+        """Remove an object from the list of selector instances.
+
+        Parameters
+        ----------
+        obj : compas_view2.objects.Object
+            the target object
+
+        Returns
+        -------
+        None
+        """
+        if obj._pick_id is not None and self._id_to_obj[obj._pick_id - 1] is obj:
+            # keep the slot, such that the pick IDs of the other objects remain valid
+            self._id_to_obj[obj._pick_id - 1] = None
+        if obj in self._pickable:
+            self._pickable.remove(obj)
+
+    def object_from_rgb(self, rgb):
+        """Find the object corresponding to a pixel color of the instance map
+
+        Parameters
+        ----------
+        rgb : tuple[int, int, int]
+            the pixel color
 
         Returns
         -------
-        rgb_key
-            a rgb tuple key that represents this object
+        compas_view2.objects.Object | None
+            the object, or None if the color does not belong to an object
         """
-        rgb_key = self.get_rgb_key()
-        self.instances[rgb_key] = obj
-        obj._instance_color = np.array(rgb_key) / 255
-        return rgb_key
+        pick_id = rgb_to_pick_id(rgb)
+        if 0 < pick_id <= len(self._id_to_obj):
+            return self._id_to_obj[pick_id - 1]
+        return None
 
     def select_one_from_instance_map(self, x, y, instance_map):
         """Select the object at given pixel location of the instance map
@@ -186,10 +399,7 @@ class Selector:
         -------
         None
         """
-        rgb_key = tuple(instance_map[y][x])
-        obj = None
-        if rgb_key in self.instances:
-            obj = self.instances[rgb_key]
+        obj = self.object_from_rgb(instance_map[y][x])
         self.select(obj)
 
     def select_all_from_instance_map(self, instance_map):
@@ -206,9 +416,8 @@ class Selector:
         """
         unique_rgbs = np.unique(instance_map.reshape(-1, instance_map.shape[2]), axis=0)
         for rgb in unique_rgbs:
-            rgb_key = tuple(rgb)
-            if rgb_key in self.instances:
-                obj = self.instances[rgb_key]
+            obj = self.object_from_rgb(rgb)
+            if obj is not None:
                 self.select(obj)
 
     def select(self, obj=None, mode=None, types=None, update=False):
@@ -268,8 +477,9 @@ class Selector:
         if obj:
             obj.is_selected = False
         else:
-            for key in self.instances:
-                self.instances[key].is_selected = False
+            for obj in self._id_to_obj:
+                if obj is not None:
+                    obj.is_selected = False
         if update:
             self.app.view.update()
 
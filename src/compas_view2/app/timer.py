@@ -2,12 +2,39 @@ from qtpy import QtCore
 
 
 class Timer:
-    def __init__(self, interval, callback, singleshot=False):
-        self.timer = QtCore.QTimer()
+    """Wrapper around a Qt timer that calls a callback from the event loop.
+
+    Parameters
+    ----------
+    interval : int
+        The interval of the timer, in milliseconds.
+    callback : callable
+        The function that is called on every timeout.
+    singleshot : bool, optional
+        If True, the timer fires only once.
+    parent : :class:`PySide2.QtCore.QObject`, optional
+        The parent of the Qt timer.
+
+    Notes
+    -----
+    If the interval is a multiple of one second, a very coarse timer is used,
+    which lets the OS wake up the process less often.
+    Otherwise a coarse timer is used, which is accurate to about 5% of the interval.
+    """
+
+    def __init__(self, interval, callback, singleshot=False, parent=None):
+        self.timer = QtCore.QTimer(parent)
         self.timer.setInterval(interval)
+        if interval and interval % 1000 == 0:
+            self.timer.setTimerType(QtCore.Qt.VeryCoarseTimer)
+        else:
+            self.timer.setTimerType(QtCore.Qt.CoarseTimer)
         self.timer.timeout.connect(callback)
         self.timer.setSingleShot(singleshot)
         self.timer.start()
 
+    def start(self):
+        self.timer.start()
+
     def stop(self):
         self.timer.stop()
@@ -1,4 +1,4 @@
-import ctypes as ct
+import numpy as np
 from OpenGL import GL
 
 
@@ -24,13 +24,20 @@ def gl_info():
     return info
 
 
+def _as_array(data, dtype):
+    """Convert buffer data to a flat, contiguous array without unpacking it into ctypes."""
+    if isinstance(data, np.ndarray):
+        return np.ascontiguousarray(data, dtype=dtype).ravel()
+    return np.fromiter(data, dtype=dtype)
+
+
 def make_vertex_buffer(data, dynamic=False):
     """Make a vertex buffer from the given data.
 
     Parameters
     ----------
-    data: list[float]
-        A flat list of floats.
+    data: list[float] | :class:`numpy.ndarray`
+        A flat list of floats, or an array of floats.
     dynamic : bool, optional
         If True, the buffer is optimized for dynamic access.
 
@@ -47,12 +54,10 @@ def make_vertex_buffer(data, dynamic=False):
 
     """
     access = GL.GL_DYNAMIC_DRAW if dynamic else GL.GL_STATIC_DRAW
-    n = len(data)
-    size = n * ct.sizeof(ct.c_float)
+    data = _as_array(data, np.float32)
     vbo = GL.glGenBuffers(1)
-    data = (ct.c_float * n)(*data)
     GL.glBindBuffer(GL.GL_ARRAY_BUFFER, vbo)
-    GL.glBufferData(GL.GL_ARRAY_BUFFER, size, data, access)
+    GL.glBufferData(GL.GL_ARRAY_BUFFER, data.nbytes, data, access)
     GL.glBindBuffer(GL.GL_ARRAY_BUFFER, 0)
     return vbo
 
@@ -62,8 +67,8 @@ def make_index_buffer(data, dynamic=False):
 
     Parameters
     ----------
-    data: list[int]
-        A flat list of ints.
+    data: list[int] | :class:`numpy.ndarray`
+        A flat list of ints, or an array of ints.
     dynamic : bool, optional
         If True, the buffer is optimized for dynamic access.
 
@@ -80,12 +85,10 @@ def make_index_buffer(data, dynamic=False):
 
     """
     access = GL.GL_DYNAMIC_DRAW if dynamic else GL.GL_STATIC_DRAW
-    n = len(data)
-    size = n * ct.sizeof(ct.c_uint)
+    data = _as_array(data, np.uint32)
     vbo = GL.glGenBuffers(1)
-    data = (ct.c_int * n)(*data)
     GL.glBindBuffer(GL.GL_ELEMENT_ARRAY_BUFFER, vbo)
-    GL.glBufferData(GL.GL_ELEMENT_ARRAY_BUFFER, size, data, access)
+    GL.glBufferData(GL.GL_ELEMENT_ARRAY_BUFFER, data.nbytes, data, access)
     GL.glBindBuffer(GL.GL_ELEMENT_ARRAY_BUFFER, 0)
     return vbo
 
@@ -95,8 +98,8 @@ def update_vertex_buffer(data, buffer):
 
     Parameters
     ----------
-    data: list[float]
-        A flat list of floats.
+    data: list[float] | :class:`numpy.ndarray`
+        A flat list of floats, or an array of floats.
     buffer : int
         The ID of the buffer.
 
@@ -105,11 +108,9 @@ def update_vertex_buffer(data, buffer):
     None
 
     """
-    n = len(data)
-    size = n * ct.sizeof(ct.c_float)
-    data = (ct.c_float * n)(*data)
+    data = _as_array(data, np.float32)
     GL.glBindBuffer(GL.GL_ARRAY_BUFFER, buffer)
-    GL.glBufferSubData(GL.GL_ARRAY_BUFFER, 0, size, data)
+    GL.glBufferSubData(GL.GL_ARRAY_BUFFER, 0, data.nbytes, data)
     GL.glBindBuffer(GL.GL_ARRAY_BUFFER, 0)
 
 
@@ -118,8 +119,8 @@ def update_index_buffer(data, buffer):
 
     Parameters
     ----------
-    data: list[int]
-        A flat list of ints.
+    data: list[int] | :class:`numpy.ndarray`
+        A flat list of ints, or an array of ints.
     buffer : int
         The ID of the buffer.
 
@@ -128,9 +129,103 @@ def update_index_buffer(data, buffer):
     None
 
     """
-    n = len(data)
-    size = n * ct.sizeof(ct.c_uint)
-    data = (ct.c_int * n)(*data)
+    data = _as_array(data, np.uint32)
     GL.glBindBuffer(GL.GL_ELEMENT_ARRAY_BUFFER, buffer)
-    GL.glBufferSubData(GL.GL_ELEMENT_ARRAY_BUFFER, 0, size, data)
+    GL.glBufferSubData(GL.GL_ELEMENT_ARRAY_BUFFER, 0, data.nbytes, data)
     GL.glBindBuffer(GL.GL_ELEMENT_ARRAY_BUFFER, 0)
+
+
+def make_pick_framebuffer(width=1, height=1):
+    """Make an offscreen framebuffer for instance picking.
+
+    Parameters
+    ----------
+    width : int, optional
+        The width of the framebuffer in pixels.
+    height : int, optional
+        The height of the framebuffer in pixels.
+
+    Returns
+    -------
+    int
+        Framebuffer ID.
+
+    Notes
+    -----
+    The framebuffer has an RGBA8 color attachment and a 24-bit depth attachment.
+    The framebuffer that was bound before the call is bound again afterwards.
+
+    """
+    previous = GL.glGetIntegerv(GL.GL_FRAMEBUFFER_BINDING)
+    fbo = GL.glGenFramebuffers(1)
+    GL.glBindFramebuffer(GL.GL_FRAMEBUFFER, fbo)
+    color = GL.glGenRenderbuffers(1)
+    GL.glBindRenderbuffer(GL.GL_RENDERBUFFER, color)
+    GL.glRenderbufferStorage(GL.GL_RENDERBUFFER, GL.GL_RGBA8, width, height)
+    GL.glFramebufferRenderbuffer(GL.GL_FRAMEBUFFER, GL.GL_COLOR_ATTACHMENT0, GL.GL_RENDERBUFFER, color)
+    depth = GL.glGenRenderbuffers(1)
+    GL.glBindRenderbuffer(GL.GL_RENDERBUFFER, depth)
+    GL.glRenderbufferStorage(GL.GL_RENDERBUFFER, GL.GL_DEPTH_COMPONENT24, width, height)
+    GL.glFramebufferRenderbuffer(GL.GL_FRAMEBUFFER, GL.GL_DEPTH_ATTACHMENT, GL.GL_RENDERBUFFER, depth)
+    GL.glBindRenderbuffer(GL.GL_RENDERBUFFER, 0)
+    GL.glBindFramebuffer(GL.GL_FRAMEBUFFER, previous)
+    return fbo
+
+
+def make_pixel_pack_buffer(size):
+    """Make a pixel pack buffer for the asynchronous read back of pixels.
+
+    Parameters
+    ----------
+    size : int
+        The size of the buffer in bytes.
+
+    Returns
+    -------
+    int
+        Pixel pack buffer ID.
+
+    """
+    pbo = GL.glGenBuffers(1)
+    GL.glBindBuffer(GL.GL_PIXEL_PACK_BUFFER, pbo)
+    GL.glBufferData(GL.GL_PIXEL_PACK_BUFFER, size, None, GL.GL_STREAM_READ)
+    GL.glBindBuffer(GL.GL_PIXEL_PACK_BUFFER, 0)
+    return pbo
+
+
+def read_pixel_pack_buffer(buffer, size):
+    """Read the contents of a pixel pack buffer.
+
+    Parameters
+    ----------
+    buffer : int
+        The ID of the buffer.
+    size : int
+        The number of bytes to read.
+
+    Returns
+    -------
+    bytes
+
+    """
+    GL.glBindBuffer(GL.GL_PIXEL_PACK_BUFFER, buffer)
+    data = GL.glGetBufferSubData(GL.GL_PIXEL_PACK_BUFFER, 0, size)
+    GL.glBindBuffer(GL.GL_PIXEL_PACK_BUFFER, 0)
+    return bytes(data)
+
+
+def delete_buffers(buffers):
+    """Delete vertex, index or pixel buffers.
+
+    Parameters
+    ----------
+    buffers : list[int]
+        The IDs of the buffers.
+
+    Returns
+    -------
+    None
+
+    """
+    if buffers:
+        GL.glDeleteBuffers(len(buffers), buffers)
@@ -42,16 +42,33 @@ class BufferObject(Object):
         Returns
         -------
         buffer_dict
-           A dict with created buffer indexes
+           A dict with created buffer indexes,
+           and a copy of the positions and elements for batching the geometry of the selector.
+
+        Notes
+        -----
+        The data is converted to arrays once, and the arrays are uploaded directly,
+        instead of flattening the data into lists of Python floats first.
         """
-        positions, colors, elements = data
+        positions, colors, elements = self._data_to_arrays(data)
         return {
-            "positions": make_vertex_buffer(list(flatten(positions))),
-            "colors": make_vertex_buffer(list(flatten(colors))),
-            "elements": make_index_buffer(list(flatten(elements))),
-            "n": len(list(flatten(elements))),
+            "positions": make_vertex_buffer(positions),
+            "colors": make_vertex_buffer(colors),
+            "elements": make_index_buffer(elements),
+            "n": len(elements),
+            "position_array": positions,
+            "element_array": elements,
         }
 
+    @staticmethod
+    def _data_to_arrays(data):
+        """Convert point/line/face data to float32 positions and colors, and uint32 elements"""
+        positions, colors, elements = data
+        positions = np.array(positions, dtype=np.float32).reshape(-1, 3)
+        colors = np.fromiter(flatten(colors), dtype=np.float32)
+        elements = np.fromiter(flatten(elements), dtype=np.uint32)
+        return positions, colors, elements
+
     def update_buffer_from_data(self, data, buffer, update_positions=True, update_colors=True, update_elements=True):
         """Update existing buffers from point/line/face data.
 
@@ -68,14 +85,16 @@ class BufferObject(Object):
         update_elements : bool
             Whether to update elements in the buffer dict
         """
-        positions, colors, elements = data
+        positions, colors, elements = self._data_to_arrays(data)
         if update_positions:
-            update_vertex_buffer(list(flatten(positions)), buffer["positions"])
+            update_vertex_buffer(positions, buffer["positions"])
+            buffer["position_array"] = positions
         if update_colors:
-            update_vertex_buffer(list(flatten(colors)), buffer["colors"])
+            update_vertex_buffer(colors, buffer["colors"])
         if update_elements:
-            update_index_buffer(list(flatten(elements)), buffer["elements"])
-        buffer["n"] = len(list(flatten(elements)))
+            update_index_buffer(elements, buffer["elements"])
+            buffer["element_array"] = elements
+        buffer["n"] = len(elements)
 
     def make_buffers(self):
         """Create all buffers from object's data"""
@@ -87,17 +106,17 @@ class BufferObject(Object):
         if hasattr(self, "_lines_data"):
             data = self._lines_data()
             self._lines_buffer = self.make_buffer_from_data(data)
-            if data[0] and self._bounding_box_center is None:
+            if data[0] and self._local_bounding_box is None:
                 self._update_bounding_box(data[0])
         if hasattr(self, "_frontfaces_data"):
             data = self._frontfaces_data()
             self._frontfaces_buffer = self.make_buffer_from_data(data)
-            if data[0] and self._bounding_box_center is None:
+            if data[0] and self._local_bounding_box is None:
                 self._update_bounding_box(data[0])
         if hasattr(self, "_backfaces_data"):
             data = self._backfaces_data()
             self._backfaces_buffer = self.make_buffer_from_data(data)
-            if data[0] and self._bounding_box_center is None:
+            if data[0] and self._local_bounding_box is None:
                 self._update_bounding_box(data[0])
 
     def update_buffers(self):
@@ -119,8 +138,26 @@ class BufferObject(Object):
     def update(self):
         """Update the object"""
         self._update_matrix()
+        if self._init_pending:
+            # the buffers will be created from the current data when the pending initialization is flushed
+            return
         self.update_buffers()
 
+    @property
+    def bounding_box(self):
+        if self._bounding_box is None and self._local_bounding_box is not None:
+            # the bounding box is transformed only when it is needed,
+            # such that the matrices of all objects initialized together are composed in one go
+            self._bounding_box = transform_points_numpy(self._local_bounding_box, self.transformation)
+            self._bounding_box_center = np.average(self._bounding_box, axis=0)
+        return self._bounding_box
+
+    @property
+    def bounding_box_center(self):
+        if self.bounding_box is None:
+            return None
+        return self._bounding_box_center
+
     def _update_bounding_box(self, positions=None):
         """Update the bounding box of the object"""
         if positions is None:
@@ -135,10 +172,9 @@ class BufferObject(Object):
                 return
 
         positions = np.array(positions)
-        self._bounding_box = transform_points_numpy(
-            np.array([positions.min(axis=0), positions.max(axis=0)]), self._transformation
-        )
-        self._bounding_box_center = np.average(self.bounding_box, axis=0)
+        self._local_bounding_box = np.array([positions.min(axis=0), positions.max(axis=0)])
+        self._bounding_box = None
+        self._bounding_box_center = None
 
     def draw(self, shader, wireframe=False, is_lighted=False):
         """Draw the object from its buffers"""
@@ -205,26 +241,12 @@ class BufferObject(Object):
         shader.disable_attribute("position")
         shader.disable_attribute("color")
 
-    def draw_instance(self, shader, wireframe=False):
-        """Draw the object instance for picking"""
-        shader.enable_attribute("position")
-        shader.uniform3f("instance_color", self._instance_color)
-        if self._matrix_buffer is not None:
-            shader.uniform4x4("transform", self._matrix_buffer)
+    def _instance_buffers(self, wireframe=False):
+        """Yield the primitive type, the size and the buffer of the geometry that is drawn for picking"""
         if hasattr(self, "_points_buffer") and self.show_points:
-            shader.bind_attribute("position", self._points_buffer["positions"])
-            shader.draw_points(
-                size=self.pointsize, elements=self._points_buffer["elements"], n=self._points_buffer["n"]
-            )
+            yield "points", self.pointsize, self._points_buffer
         if hasattr(self, "_lines_buffer") and (self.show_lines or wireframe):
-            shader.bind_attribute("position", self._lines_buffer["positions"])
-            shader.draw_lines(width=self.linewidth, elements=self._lines_buffer["elements"], n=self._lines_buffer["n"])
+            yield "lines", self.linewidth, self._lines_buffer
         if hasattr(self, "_frontfaces_buffer") and self.show_faces and not wireframe:
-            shader.bind_attribute("position", self._frontfaces_buffer["positions"])
-            shader.draw_triangles(elements=self._frontfaces_buffer["elements"], n=self._frontfaces_buffer["n"])
-            shader.bind_attribute("position", self._backfaces_buffer["positions"])
-            shader.draw_triangles(elements=self._backfaces_buffer["elements"], n=self._backfaces_buffer["n"])
-        if self._matrix_buffer is not None:
-            shader.uniform4x4("transform", np.identity(4).flatten())
-        shader.uniform3f("instance_color", [0, 0, 0])
-        shader.disable_attribute("position")
+            yield "triangles", 0, self._frontfaces_buffer
+            yield "triangles", 0, self._backfaces_buffer
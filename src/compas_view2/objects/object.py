@@ -199,13 +199,16 @@ class Object(ABC):
         self.opacity = opacity
         self.background = False
 
-        self._instance_color = None
+        self._pick_id = None
+        self._view_index = None
+        self._init_pending = False
         self._translation = [0.0, 0.0, 0.0]
         self._rotation = [0.0, 0.0, 0.0]
         self._scale = [1.0, 1.0, 1.0]
         self._transformation = Transformation()
         self._matrix_buffer = None
 
+        self._local_bounding_box = None
         self._bounding_box = None
         self._bounding_box_center = None
         self._is_collection = False
@@ -293,7 +296,12 @@ class Object(ABC):
 
     def _update_matrix(self):
         """Update the matrix from object's translation, rotation and scale"""
-        if (not self.parent or self.parent._matrix_buffer is None) and (
+        self._bounding_box = None
+        self._bounding_box_center = None
+        if self._view_index is not None:
+            # the matrix is composed together with those of the other objects of the view when it is needed
+            self._app.view.set_local_transform(self._view_index, self.translation, self.rotation, self.scale)
+        elif (not self.parent or self.parent._matrix_buffer is None) and (
             self.translation == [0, 0, 0] and self.rotation == [0, 0, 0] and self.scale == [1, 1, 1]
         ):
             self._transformation.matrix = identity_matrix(4)
@@ -312,6 +320,8 @@ class Object(ABC):
 
     @property
     def transformation(self):
+        if self._view_index is not None:
+            self._app.view.update_transforms()
         return self._transformation
 
     @property
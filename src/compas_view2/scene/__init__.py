@@ -1,6 +1,8 @@
 from .matrices import ortho  # noqa : F401
 from .matrices import perspective  # noqa : F401
 from .matrices import lookat  # noqa : F401
+from .matrices import pick  # noqa : F401
+from .matrices import compose_matrices  # noqa : F401
 
 from .camera import Camera  # noqa : F401
 from .mouse import Mouse  # noqa : F401
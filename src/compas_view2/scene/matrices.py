@@ -1,6 +1,7 @@
 from math import tan
 from math import radians
 
+import numpy as np
 from compas.geometry import Transformation
 from compas.geometry import normalize_vector
 from compas.geometry import subtract_vectors
@@ -72,6 +73,89 @@ def perspective(fov, aspect, near, far):
     return Transformation.from_matrix(matrix)
 
 
+def pick(x, y, width, height, size=1):
+    """Construct a picking matrix that maps a square region of pixels of the view onto the entire clip space.
+
+    Parameters
+    ----------
+    x : float
+        The x coordinate of the center pixel, measured from the left of the view.
+    y : float
+        The y coordinate of the center pixel, measured from the top of the view.
+    width : float
+        Width of the view.
+    height : float
+        Height of the view.
+    size : int, optional
+        The number of pixels along the sides of the region.
+
+    Returns
+    -------
+    :class:`compas.geometry.Transformation`
+
+    Notes
+    -----
+    Applied after a projection matrix, this is the equivalent of rendering
+    the view with a viewport of ``size`` by ``size`` pixels that is centered on the given pixel.
+
+    """
+    cx = x + 0.5
+    cy = height - y - 0.5
+    matrix = [
+        [width / size, 0, 0, (width - 2 * cx) / size],
+        [0, height / size, 0, (height - 2 * cy) / size],  # noqa: E201
+        [0, 0, 1, 0],  # noqa: E201
+        [0, 0, 0, 1],  # noqa: E201
+    ]
+    return Transformation.from_matrix(matrix)
+
+
+def compose_matrices(translations, rotations, scales):
+    """Compose the transformation matrices of many objects at once.
+
+    Parameters
+    ----------
+    translations : array-like
+        The translation vectors of the objects, as an array of shape (N, 3).
+    rotations : array-like
+        The static XYZ Euler angles of the objects, in radians, as an array of shape (N, 3).
+    scales : array-like
+        The scale factors of the objects, as an array of shape (N, 3).
+
+    Returns
+    -------
+    :class:`numpy.ndarray`
+        The transformation matrices, as an array of shape (N, 4, 4).
+
+    Notes
+    -----
+    Every matrix is the equivalent of ``T * R * S``, with ``T`` a :class:`compas.geometry.Translation`,
+    ``R`` a :class:`compas.geometry.Rotation` from the Euler angles, and ``S`` a :class:`compas.geometry.Scale`.
+
+    """
+    translations = np.asarray(translations, dtype=np.float64).reshape(-1, 3)
+    rotations = np.asarray(rotations, dtype=np.float64).reshape(-1, 3)
+    scales = np.asarray(scales, dtype=np.float64).reshape(-1, 3)
+    cx, cy, cz = np.cos(rotations).T
+    sx, sy, sz = np.sin(rotations).T
+    # R = Rz * Ry * Rx
+    R = np.empty((len(rotations), 3, 3), dtype=np.float64)
+    R[:, 0, 0] = cy * cz
+    R[:, 0, 1] = sx * sy * cz - cx * sz
+    R[:, 0, 2] = cx * sy * cz + sx * sz
+    R[:, 1, 0] = cy * sz
+    R[:, 1, 1] = sx * sy * sz + cx * cz
+    R[:, 1, 2] = cx * sy * sz - sx * cz
+    R[:, 2, 0] = -sy
+    R[:, 2, 1] = sx * cy
+    R[:, 2, 2] = cx * cy
+    matrices = np.zeros((len(rotations), 4, 4), dtype=np.float64)
+    matrices[:, :3, :3] = R * scales[:, None, :]
+    matrices[:, :3, 3] = translations
+    matrices[:, 3, 3] = 1
+    return matrices
+
+
 def lookat(eye, target, up):
     """Construct a "look at" transformation matrix.
 
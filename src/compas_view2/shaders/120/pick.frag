@@ -0,0 +1,8 @@
+#version 120
+
+varying vec3 pick_color;
+
+void main()
+{
+    gl_FragColor = vec4(pick_color, 1);
+}
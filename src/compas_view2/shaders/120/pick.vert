@@ -0,0 +1,19 @@
+#version 120
+
+attribute vec3 position;
+attribute float pick_id;
+
+uniform mat4 projection;
+uniform mat4 viewworld;
+
+varying vec3 pick_color;
+
+void main()
+{
+    // encode the pick ID in RGB, with R holding the lowest byte
+    float r = mod(pick_id, 256.0);
+    float g = mod(floor(pick_id / 256.0), 256.0);
+    float b = floor(pick_id / 65536.0);
+    pick_color = vec3(r, g, b) / 255.0;
+    gl_Position = projection * viewworld * vec4(position, 1.0);
+}
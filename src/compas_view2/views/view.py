@@ -1,15 +1,16 @@
 import time
 
+import numpy as np
 from OpenGL import GL
-from qtpy import QtCore
-from qtpy import QtWidgets
+from qtpy import QtGui
 
 from compas_view2.objects import GridObject
 from compas_view2.scene import Camera
+from compas_view2.scene import compose_matrices
 
 
-class View(QtWidgets.QOpenGLWidget):
-    """Base OpenGL view widget.
+class View(QtGui.QOpenGLWindow):
+    """Base OpenGL view window.
 
     Parameters
     ----------
@@ -17,13 +18,24 @@ class View(QtWidgets.QOpenGLWidget):
         The parent application of the view.
     view_config: dict
         The view configuration.
+
+    Notes
+    -----
+    The view is an OpenGL window rather than an OpenGL widget.
+    It is embedded in the main window of the app with a window container,
+    such that it has its own native surface, and its output does not have to be composited with the other widgets.
+
+    Next to the ``objects`` dict, the view stores its objects as a structure of arrays,
+    with a flat list of objects, an ``(N, 4, 4)`` array of world transforms, and an ``(N,)`` array of pick IDs,
+    such that per-frame traversals run over contiguous arrays instead of over the dict.
+    The translations, rotations and scales of the objects are stored as ``(N, 3)`` arrays,
+    from which the transforms of all changed objects are composed in one go, by :meth:`update_transforms`.
     """
 
     VIEWPORTS = {"front": 1, "right": 2, "top": 3, "perspective": 4}
 
     def __init__(self, app, view_config):
         super().__init__()
-        self.setFocusPolicy(QtCore.Qt.StrongFocus)
         self._opacity = 1.0
         self._current = self.VIEWPORTS[view_config["viewport"]]
         self.shader_model = None
@@ -35,9 +47,18 @@ class View(QtWidgets.QOpenGLWidget):
         self.camera = Camera(self, **view_config["camera"])
         self.grid = GridObject(1, 10, 10)
         self.objects = {}
+        self._objects = []
+        self._transforms = np.zeros((0, 4, 4), dtype=np.float32)
+        self._pick_ids = np.zeros((0,), dtype=np.uint32)
+        self._translations = np.zeros((0, 3), dtype=np.float64)
+        self._rotations = np.zeros((0, 3), dtype=np.float64)
+        self._scales = np.zeros((0, 3), dtype=np.float64)
+        self._stale = np.zeros((0,), dtype=bool)
+        self._has_stale = False
         self.keys = {"shift": False, "control": False, "f": False}
         self._frames = 0
         self._now = time.time()
+        self._captures = []
 
     @property
     def mode(self):
@@ -51,6 +72,7 @@ class View(QtWidgets.QOpenGLWidget):
         else:
             self._opacity = 1.0
         if self.shader_model:
+            self.makeCurrent()
             self.shader_model.bind()
             self.shader_model.uniform1f("opacity", self._opacity)
             self.shader_model.release()
@@ -64,6 +86,7 @@ class View(QtWidgets.QOpenGLWidget):
     def current(self, current):
         self._current = current
         if self.shader_model:
+            self.makeCurrent()
             self.shader_model.bind()
             self.shader_model.uniform4x4("projection", self.camera.projection(self.app.width, self.app.height))
             self.shader_model.release()
@@ -73,6 +96,166 @@ class View(QtWidgets.QOpenGLWidget):
     def opacity(self):
         return self._opacity
 
+    def add_object(self, obj):
+        """Add an object to the view.
+
+        Parameters
+        ----------
+        obj : :class:`compas_view2.objects.Object`
+            A view object.
+
+        Returns
+        -------
+        None
+
+        """
+        if obj._view_index is not None:
+            return
+        index = len(self._objects)
+        if index == len(self._transforms):
+            # grow the arrays geometrically to keep adding objects amortized constant time
+            self._grow(max(8, 2 * index))
+        self.objects[obj] = obj
+        self._objects.append(obj)
+        self._pick_ids[index] = obj._pick_id or 0
+        obj._view_index = index
+        self.set_local_transform(index, obj.translation, obj.rotation, obj.scale)
+
+    def remove_object(self, obj):
+        """Remove an object from the view.
+
+        Parameters
+        ----------
+        obj : :class:`compas_view2.objects.Object`
+            A view object.
+
+        Returns
+        -------
+        None
+
+        Notes
+        -----
+        The last object of the arrays is moved into the slot of the removed object,
+        such that the arrays stay contiguous.
+
+        """
+        self.objects.pop(obj, None)
+        index = obj._view_index
+        if index is None:
+            return
+        self.update_transforms()
+        last = len(self._objects) - 1
+        if index != last:
+            moved = self._objects[last]
+            self._objects[index] = moved
+            for name in self._ARRAYS:
+                array = getattr(self, name)
+                array[index] = array[last]
+            moved._view_index = index
+        self._objects.pop()
+        obj._view_index = None
+
+    _ARRAYS = ("_transforms", "_pick_ids", "_translations", "_rotations", "_scales", "_stale")
+
+    def _grow(self, capacity):
+        count = len(self._objects)
+        for name in self._ARRAYS:
+            array = getattr(self, name)
+            grown = np.zeros((capacity,) + array.shape[1:], dtype=array.dtype)
+            grown[:count] = array[:count]
+            setattr(self, name, grown)
+
+    def set_local_transform(self, index, translation, rotation, scale):
+        """Store the translation, rotation and scale of an object, and mark its transform as stale.
+
+        Parameters
+        ----------
+        index : int
+            The index of the object in the arrays of the view.
+        translation : [float, float, float]
+            The translation vector of the object.
+        rotation : [float, float, float]
+            The static XYZ Euler angles of the object.
+        scale : [float, float, float]
+            The scale factors of the object.
+
+        Returns
+        -------
+        None
+
+        """
+        self._translations[index] = translation
+        self._rotations[index] = rotation
+        self._scales[index] = scale
+        self._stale[index] = True
+        self._has_stale = True
+
+    def update_transforms(self):
+        """Compose the matrices of all objects with stale transforms in one go.
+
+        Returns
+        -------
+        None
+
+        Notes
+        -----
+        The local matrices of all stale objects are composed with a single call to
+        :func:`compas_view2.scene.compose_matrices`, and the world matrices of the objects without parent
+        are written into the transform array of the view with a single assignment.
+        Only the world matrices of child objects are composed one by one.
+
+        """
+        if not self._has_stale:
+            return
+        self._has_stale = False
+        stale = np.flatnonzero(self._stale[: len(self._objects)])
+        self._stale[stale] = False
+        local = compose_matrices(self._translations[stale], self._rotations[stale], self._scales[stale])
+        identity = (
+            ~self._translations[stale].any(axis=1)
+            & ~self._rotations[stale].any(axis=1)
+            & (self._scales[stale] == 1).all(axis=1)
+        )
+        objects = [self._objects[index] for index in stale]
+        roots = np.array([obj.parent is None for obj in objects], dtype=bool)
+        self._transforms[stale[roots]] = local[roots]
+        for obj, matrix in zip(objects, local):
+            obj._transformation.matrix = matrix.tolist()
+        for obj, matrix, is_root, is_identity in zip(objects, self._transforms[stale], roots, identity):
+            if is_root:
+                obj._matrix_buffer = None if is_identity else matrix.flatten()
+            else:
+                world = np.array(obj.matrix_world, dtype=np.float32)
+                self._transforms[obj._view_index] = world
+                obj._matrix_buffer = None if is_identity and (world == np.identity(4)).all() else world.flatten()
+
+    def capture(self, filepath, fmt=None, callback=None):
+        """Capture the next painted frame of the view to an image file.
+
+        Parameters
+        ----------
+        filepath : str
+            The path of the image file.
+        fmt : str, optional
+            The format of the image file.
+            If None, the format is derived from the extension of the file path.
+        callback : callable, optional
+            A function that is called without arguments once the image file has been saved.
+
+        Returns
+        -------
+        None
+
+        Notes
+        -----
+        The framebuffer of an OpenGL window can only be read reliably while it is being painted.
+        Therefore, the capture is queued and an update of the view is requested,
+        and the image is saved by :meth:`~compas_view2.views.View.paintGL` right after the frame is painted.
+
+        """
+        self._captures.append((filepath, fmt, callback))
+        self.update()
+
     def clear(self):
         """Clear the view."""
         GL.glClear(GL.GL_COLOR_BUFFER_BIT | GL.GL_DEPTH_BUFFER_BIT)
@@ -80,7 +263,7 @@ class View(QtWidgets.QOpenGLWidget):
     def initializeGL(self):
         """Initialize the OpenGL canvas.
 
-        This implements the virtual funtion of the OpenGL widget.
+        This implements the virtual funtion of the OpenGL window.
         See the PySide2 docs [1]_ for more info.
         It sets the clear color of the view,
         and enables culling, depth testing, blending, point smoothing, and line smoothing.
@@ -90,7 +273,7 @@ class View(QtWidgets.QOpenGLWidget):
 
         References
         ----------
-        .. [1] https://doc.qt.io/qtforpython-5.12/PySide2/QtWidgets/QOpenGLWidget.html#PySide2.QtWidgets.PySide2.QtWidgets.QOpenGLWidget.initializeGL
+        .. [1] https://doc.qt.io/qtforpython-5.12/PySide2/QtGui/QOpenGLWindow.html#PySide2.QtGui.PySide2.QtGui.QOpenGLWindow.initializeGL
 
         """
         GL.glClearColor(*self.color)
@@ -113,7 +296,7 @@ class View(QtWidgets.QOpenGLWidget):
     def resizeGL(self, w, h):
         """Resize the OpenGL canvas.
 
-        This implements the virtual funtion of the OpenGL widget.
+        This implements the virtual funtion of the OpenGL window.
         See the PySide2 docs [1]_ for more info.
 
         To extend the behaviour of this function,
@@ -128,9 +311,14 @@ class View(QtWidgets.QOpenGLWidget):
 
         References
         ----------
-        .. [1] https://doc.qt.io/qtforpython-5.12/PySide2/QtWidgets/QOpenGLWidget.html#PySide2.QtWidgets.PySide2.QtWidgets.QOpenGLWidget.resizeGL
+        .. [1] https://doc.qt.io/qtforpython-5.12/PySide2/QtGui/QOpenGLWindow.html#PySide2.QtGui.PySide2.QtGui.QOpenGLWindow.resizeGL
+
+        Notes
+        -----
+        Unlike for an OpenGL widget, the context of an OpenGL window is not guaranteed to be current here.
 
         """
+        self.makeCurrent()
         GL.glViewport(0, 0, w, h)
         self.app.width = w
         self.app.height = h
@@ -142,7 +330,7 @@ class View(QtWidgets.QOpenGLWidget):
     def paintGL(self):
         """Paint the OpenGL canvas.
 
-        This implements the virtual funtion of the OpenGL widget.
+        This implements the virtual funtion of the OpenGL window.
         See the PySide2 docs [1]_ for more info.
 
         To extend the behaviour of this function,
@@ -150,16 +338,26 @@ class View(QtWidgets.QOpenGLWidget):
 
         Notes
         -----
-        This method also paints the instance map used by the selector to identify selected objects.
-        The instance map is immediately cleared again, after which the real scene objects are drawn.
+        The instance maps used by the selector to identify selected objects are not painted here,
+        but on demand by the selector, see :meth:`~compas_view2.app.Selector.pick`.
+
+        Captures requested with :meth:`~compas_view2.views.View.capture` are saved right after painting,
+        while the back buffer still holds the painted frame.
 
         References
         ----------
-        .. [1] https://doc.qt.io/qtforpython-5.12/PySide2/QtWidgets/QOpenGLWidget.html#PySide2.QtWidgets.PySide2.QtWidgets.QOpenGLWidget.paintGL
+        .. [1] https://doc.qt.io/qtforpython-5.12/PySide2/QtGui/QOpenGLWindow.html#PySide2.QtGui.PySide2.QtGui.QOpenGLWindow.paintGL
 
         """
         self.clear()
         self.paint()
+        if self._captures:
+            captures, self._captures = self._captures, []
+            qimage = self.grabFramebuffer()
+            for filepath, fmt, callback in captures:
+                qimage.save(filepath, fmt)
+                if callback:
+                    callback()
         self._frames += 1
         if time.time() - self._now > 1:
             self._now = time.time()
@@ -169,7 +367,10 @@ class View(QtWidgets.QOpenGLWidget):
     def paint(self):
         pass
 
-    def paint_instances(self):
+    def paint_instances(self, cropped_box=None):
+        pass
+
+    def paint_pick(self, x, y, buffer, size=1):
         pass
 
     def paint_plane(self):
@@ -185,8 +386,13 @@ class View(QtWidgets.QOpenGLWidget):
         ----------
         event : PySide2.QtGui.QMouseEvent
             The Qt event.
+
+        Notes
+        -----
+        Unlike a widget, a window also receives mouse move events if no button is pressed.
+        These are ignored, to avoid repainting the view while the mouse is only hovering over it.
         """
-        if not self.isActiveWindow() or not self.underMouse():
+        if not self.isActive() or not event.buttons():
             return
         else:
             self.app.controller.mouse_move_action(event)
@@ -199,7 +405,7 @@ class View(QtWidgets.QOpenGLWidget):
         event : PySide2.QtGui.QMouseEvent
             The Qt event.
         """
-        if not self.isActiveWindow() or not self.underMouse():
+        if not self.isActive():
             return
         else:
             self.app.controller.mouse_press_action(event)
@@ -212,7 +418,7 @@ class View(QtWidgets.QOpenGLWidget):
         event : PySide2.QtGui.QMouseEvent
             The Qt event.
         """
-        if not self.isActiveWindow() or not self.underMouse():
+        if not self.isActive():
             return
         else:
             self.app.controller.mouse_release_action(event)
@@ -227,7 +433,7 @@ class View(QtWidgets.QOpenGLWidget):
         event : PySide2.QtGui.QMouseEvent
             The Qt event.
         """
-        if not self.isActiveWindow() or not self.underMouse():
+        if not self.isActive():
             return
         else:
             self.app.controller.wheel_action(event)
@@ -1,12 +1,12 @@
-import os
+import ctypes as ct
 
 import numpy as np
 from OpenGL import GL
 
-from compas.geometry import transform_points_numpy
 from compas_view2.objects import BufferObject
 from compas_view2.objects import TextObject
 from compas_view2.objects import VectorObject
+from compas_view2.scene import pick
 from compas_view2.shaders import Shader
 
 from .view import View
@@ -15,13 +15,13 @@ from .view import View
 
 
 class View120(View):
-    """View widget for OpenGL version 2.1 and GLSL 120 with a Compatibility Profile."""
+    """View window for OpenGL version 2.1 and GLSL 120 with a Compatibility Profile."""
 
     def init(self):
         self.grid.init()
+        self.app.selector.init()
         # init the buffers
-        for guid in self.objects:
-            obj = self.objects[guid]
+        for obj in self._objects:
             obj.init()
 
         projection = self.camera.projection(self.app.width, self.app.height)
@@ -55,12 +55,11 @@ class View120(View):
         self.shader_arrow.uniform1f("aspect", self.app.width / self.app.height)
         self.shader_arrow.release()
 
-        self.shader_instance = Shader(name="120/instance")
-        self.shader_instance.bind()
-        self.shader_instance.uniform4x4("projection", projection)
-        self.shader_instance.uniform4x4("viewworld", viewworld)
-        self.shader_instance.uniform4x4("transform", transform)
-        self.shader_instance.release()
+        self.shader_pick = Shader(name="120/pick")
+        self.shader_pick.bind()
+        self.shader_pick.uniform4x4("projection", projection)
+        self.shader_pick.uniform4x4("viewworld", viewworld)
+        self.shader_pick.release()
 
         self.shader_grid = Shader(name="120/grid")
         self.shader_grid.bind()
@@ -73,6 +72,7 @@ class View120(View):
         w = w or self.app.width
         h = h or self.app.height
 
+        self.makeCurrent()
         projection = self.camera.projection(w, h)
         self.shader_model.bind()
         self.shader_model.uniform4x4("projection", projection)
@@ -87,9 +87,9 @@ class View120(View):
         self.shader_arrow.uniform1f("aspect", w / h)
         self.shader_arrow.release()
 
-        self.shader_instance.bind()
-        self.shader_instance.uniform4x4("projection", projection)
-        self.shader_instance.release()
+        self.shader_pick.bind()
+        self.shader_pick.uniform4x4("projection", projection)
+        self.shader_pick.release()
 
         self.shader_grid.bind()
         self.shader_grid.uniform4x4("projection", projection)
@@ -102,38 +102,37 @@ class View120(View):
         """Sort objects by the distances from their bounding box centers to camera location"""
         opaque_objects = []
         transparent_objects = []
+        indices = []
         centers = []
-        for guid in self.objects:
-            obj = self.objects[guid]
+        for index, obj in enumerate(self._objects):
             if isinstance(obj, BufferObject):
                 if obj.opacity * self.opacity < 1 and obj.bounding_box_center is not None:
                     transparent_objects.append(obj)
-                    centers.append(transform_points_numpy([obj.bounding_box_center], obj.matrix)[0])
+                    indices.append(index)
+                    centers.append(obj.bounding_box_center)
                 else:
                     opaque_objects.append(obj)
         if transparent_objects:
-            centers = transform_points_numpy(centers, viewworld)
-            transparent_objects = sorted(zip(transparent_objects, centers), key=lambda pair: pair[1][2])
-            transparent_objects, _ = zip(*transparent_objects)
-        return opaque_objects + list(transparent_objects)
+            # the view depths of all centers at once, using the world transforms of the view
+            centers = np.hstack([np.asarray(centers, dtype=np.float32), np.ones((len(centers), 1), dtype=np.float32)])
+            row = np.asarray(viewworld, dtype=np.float32)[2]
+            depths = np.einsum("j,kjl,kl->k", row, self._transforms[indices], centers)
+            transparent_objects = [transparent_objects[i] for i in np.argsort(depths, kind="stable")]
+        return opaque_objects + transparent_objects
 
     def paint(self):
         viewworld = self.camera.viewworld()
         if self.current != self.VIEWPORTS["perspective"]:
             self.update_projection()
 
-        # Draw instance maps
-        if self.app.selector.enabled:
-            self.shader_instance.bind()
-            # set projection matrix
-            self.shader_instance.uniform4x4("viewworld", viewworld)
-            if self.app.selector.select_from == "pixel":
-                self.app.selector.instance_map = self.paint_instances()
-            if self.app.selector.select_from == "box":
-                self.app.selector.instance_map = self.paint_instances(self.app.selector.box_select_coords)
-            self.app.selector.enabled = False
-            self.clear()
-            self.shader_instance.release()
+        # Initialize the objects that were added since the last frame
+        self.app._flush_init(update_view=False)
+
+        # Compose the transforms of all objects that changed since the last frame
+        self.update_transforms()
+
+        # Resolve the pick that was requested before this frame
+        self.app.selector.resolve_pick()
 
         # Draw grid
         self.shader_grid.bind()
@@ -156,8 +155,7 @@ class View120(View):
         # draw arrow sprites
         self.shader_arrow.bind()
         self.shader_arrow.uniform4x4("viewworld", viewworld)
-        for guid in self.objects:
-            obj = self.objects[guid]
+        for obj in self._objects:
             if isinstance(obj, VectorObject):
                 if obj.is_visible:
                     obj.draw(self.shader_arrow)
@@ -166,8 +164,7 @@ class View120(View):
         # draw text sprites
         self.shader_text.bind()
         self.shader_text.uniform4x4("viewworld", viewworld)
-        for guid in self.objects:
-            obj = self.objects[guid]
+        for obj in self._objects:
             if isinstance(obj, TextObject):
                 if obj.is_visible:
                     obj.draw(self.shader_text, self.camera.position)
@@ -177,20 +174,99 @@ class View120(View):
         if self.app.selector.select_from == "box":
             self.shader_model.draw_2d_box(self.app.selector.box_select_coords, self.app.width, self.app.height)
 
-        if self.app.record:
-            # r = self.devicePixelRatio()
-            # x, y, width, height = 0, 0, self.app.width, self.app.height
-            # buffer = GL.glReadPixels(x*r, y*r, width*r, height*r, GL.GL_RGB, GL.GL_UNSIGNED_BYTE)
-            # arr = np.frombuffer(buffer, dtype=np.uint8).reshape(height*r, width*r, 3)
-            # arr = arr[::-r, ::r, :]
-            # im = Image.fromarray(arr, mode="RGB")
-            # im = im.convert(mode='RGB', dither=0)
-            # print("recording frame:", self.app.frame_count)
-            # self.app.recorded_frames.append(im)
-            qimage = self.grabFramebuffer()
-            qimage.save(os.path.join(self.app.tempdir, f"{self.app.frame_count}.png"), "png")
+    def draw_instances(self, projection=None):
+        """Draw the instance colors of all visible pickable objects.
+
+        Parameters
+        ----------
+        projection : 4x4 np.array, optional
+            A projection matrix that temporarily replaces the one of the camera.
+
+        Notes
+        -----
+        The geometry is drawn from the merged buffers of the selector,
+        with one draw call per primitive type and size.
+
+        """
+        self.shader_pick.bind()
+        self.shader_pick.uniform4x4("viewworld", self.camera.viewworld())
+        if projection is not None:
+            self.shader_pick.uniform4x4("projection", projection)
+        self.shader_pick.enable_attribute("position")
+        self.shader_pick.enable_attribute("pick_id")
+        for (mode, size), batch in self.app.selector._batches.items():
+            self.shader_pick.bind_attribute("position", batch["positions"])
+            self.shader_pick.bind_attribute("pick_id", batch["pick_ids"], step=1)
+            if mode == "points":
+                self.shader_pick.draw_points(size=size, elements=batch["elements"], n=batch["n"])
+            elif mode == "lines":
+                self.shader_pick.draw_lines(width=size, elements=batch["elements"], n=batch["n"])
+            else:
+                self.shader_pick.draw_triangles(elements=batch["elements"], n=batch["n"])
+        self.shader_pick.disable_attribute("position")
+        self.shader_pick.disable_attribute("pick_id")
+        if projection is not None:
+            self.shader_pick.uniform4x4("projection", self.camera.projection(self.app.width, self.app.height))
+        self.shader_pick.release()
+
+    def paint_pick(self, x, y, buffer, size=1):
+        """Paint the instance color of the pixel under the mouse in the offscreen pick buffer.
+
+        Parameters
+        ----------
+        x : int
+            The x coordinate of the mouse.
+        y : int
+            The y coordinate of the mouse.
+        buffer : int
+            The pixel pack buffer into which the RGBA color of the pixel is read back.
+        size : int, optional
+            The odd number of pixels along the sides of the square region around the mouse that is painted.
+
+        Returns
+        -------
+        None
+
+        Notes
+        -----
+        Instead of painting and reading back the entire view,
+        the projection is narrowed down to a small region around the pixel under the mouse,
+        and only the center pixel of that region is read back.
+        Points and lines are clipped by their geometry before they are widened,
+        therefore the region has to be as large as the largest point size or line width,
+        such that a point or line is also picked if only its widened part covers the mouse.
+
+        The read back is asynchronous.
+        The color is only available from the pixel pack buffer once the GL commands have completed,
+        which is typically by the time the next frame is painted.
+
+        """
+        viewport = GL.glGetIntegerv(GL.GL_VIEWPORT)
+        GL.glBindFramebuffer(GL.GL_FRAMEBUFFER, self.app.selector._pick_fbo)
+        GL.glViewport(0, 0, size, size)
+        GL.glDisable(GL.GL_POINT_SMOOTH)
+        GL.glDisable(GL.GL_LINE_SMOOTH)
+        # the background is black, which corresponds to pick ID 0
+        GL.glClearColor(0, 0, 0, 1)
+        self.clear()
+        GL.glClearColor(*self.color)
+        projection = self.camera.projection(self.app.width, self.app.height)
+        P = pick(x, y, self.app.width, self.app.height, size).matrix
+        P = np.asfortranarray(np.dot(P, projection), dtype=np.float32)
+        self.draw_instances(P)
+        GL.glBindBuffer(GL.GL_PIXEL_PACK_BUFFER, buffer)
+        GL.glReadPixels(size // 2, size // 2, 1, 1, GL.GL_RGBA, GL.GL_UNSIGNED_BYTE, ct.c_void_p(0))
+        GL.glBindBuffer(GL.GL_PIXEL_PACK_BUFFER, 0)
+        GL.glEnable(GL.GL_POINT_SMOOTH)
+        GL.glEnable(GL.GL_LINE_SMOOTH)
+        GL.glBindFramebuffer(GL.GL_FRAMEBUFFER, self.defaultFramebufferObject())
+        GL.glViewport(*viewport)
 
     def paint_instances(self, cropped_box=None):
+        # the background is black, which corresponds to pick ID 0
+        GL.glClearColor(0, 0, 0, 1)
+        self.clear()
+        GL.glClearColor(*self.color)
         GL.glDisable(GL.GL_POINT_SMOOTH)
         GL.glDisable(GL.GL_LINE_SMOOTH)
         if cropped_box is None:
@@ -199,16 +275,10 @@ class View120(View):
             x1, y1, x2, y2 = cropped_box
             x, y = min(x1, x2), self.app.height - max(y1, y2)
             width, height = abs(x1 - x2), abs(y1 - y2)
-        for guid in self.objects:
-            obj = self.objects[guid]
-            if hasattr(obj, "draw_instance"):
-                if obj.is_visible:
-                    obj.draw_instance(self.shader_instance, self.mode == "wireframe")
+        self.draw_instances()
         # create map
-        r = self.devicePixelRatio()
-        instance_buffer = GL.glReadPixels(x * r, y * r, width * r, height * r, GL.GL_RGB, GL.GL_UNSIGNED_BYTE)
-        instance_map = np.frombuffer(instance_buffer, dtype=np.uint8).reshape(height * r, width * r, 3)
-        instance_map = instance_map[::-r, ::r, :]
+        instance_map = self.read_pixels(x, y, width, height, GL.GL_UNSIGNED_BYTE)
+        self.clear()
         GL.glEnable(GL.GL_POINT_SMOOTH)
         GL.glEnable(GL.GL_LINE_SMOOTH)
         return instance_map
@@ -216,8 +286,43 @@ class View120(View):
     def paint_plane(self):
         x, y, width, height = 0, 0, self.app.width, self.app.height
         self.grid.draw_plane(self.shader_grid)
-        r = self.devicePixelRatio()
-        plane_uv_map = GL.glReadPixels(x * r, y * r, width * r, height * r, GL.GL_RGB, GL.GL_FLOAT)
-        plane_uv_map = plane_uv_map.reshape(height * r, width * r, 3)
-        plane_uv_map = plane_uv_map[::-r, ::r, :]
+        plane_uv_map = self.read_pixels(x, y, width, height, GL.GL_FLOAT)
         return plane_uv_map
+
+    def read_pixels(self, x, y, width, height, gltype=GL.GL_UNSIGNED_BYTE):
+        """Read back the RGB values of a region of the view, per logical pixel.
+
+        Parameters
+        ----------
+        x : int
+            The x coordinate of the lower left corner of the region, in logical pixels.
+        y : int
+            The y coordinate of the lower left corner of the region, in logical pixels.
+        width : int
+            The width of the region, in logical pixels.
+        height : int
+            The height of the region, in logical pixels.
+        gltype : int, optional
+            ``GL.GL_UNSIGNED_BYTE`` or ``GL.GL_FLOAT``.
+
+        Returns
+        -------
+        :class:`numpy.ndarray`
+            The values as an array of shape (height, width, 3), with the top row first.
+
+        Notes
+        -----
+        The device pixel ratio of a window is a float, which is not necessarily a whole number.
+        The region is read back in device pixels, and resampled to logical pixels with integer indices.
+
+        """
+        r = self.devicePixelRatio()
+        x, y, width, height = int(x), int(y), int(width), int(height)
+        w = int(round(width * r))
+        h = int(round(height * r))
+        data = GL.glReadPixels(int(round(x * r)), int(round(y * r)), w, h, GL.GL_RGB, gltype)
+        dtype = np.float32 if gltype == GL.GL_FLOAT else np.uint8
+        pixels = np.frombuffer(data, dtype=dtype).reshape(h, w, 3)
+        rows = np.minimum((np.arange(height) * r).astype(int), h - 1)
+        cols = np.minimum((np.arange(width) * r).astype(int), w - 1)
+        return pixels[rows[::-1]][:, cols]
@@ -3,12 +3,11 @@ from .view import View
 
 
 class View330(View):
-    """View widget for OpenGL 3.3 and GLSL 330 and above, with a Core Profile."""
+    """View window for OpenGL 3.3 and GLSL 330 and above, with a Core Profile."""
 
     def init(self):
         # init the buffers
-        for guid in self.objects:
-            obj = self.objects[guid]
+        for obj in self._objects:
             obj.init()
         # create the program
         self.shader = Shader()
@@ -26,9 +25,9 @@ class View330(View):
         self.shader.release()
 
     def paint(self):
+        self.update_transforms()
         self.shader.bind()
         self.shader.uniform4x4("viewworld", self.camera.viewworld())
-        for guid in self.objects:
-            obj = self.objects[guid]
+        for obj in self._objects:
             obj.draw(self.shader)
         self.shader.release()
@@ -0,0 +1,44 @@
+import random
+from math import pi
+
+import numpy as np
+from compas.geometry import Rotation
+from compas.geometry import Scale
+from compas.geometry import Translation
+
+from compas_view2.scene import compose_matrices
+from compas_view2.scene import pick
+
+
+def test_compose_matrices():
+    random.seed(0)
+    translations = [[random.uniform(-10, 10) for _ in range(3)] for _ in range(20)]
+    rotations = [[random.uniform(-pi, pi) for _ in range(3)] for _ in range(20)]
+    scales = [[random.uniform(0.1, 5) for _ in range(3)] for _ in range(20)]
+
+    matrices = compose_matrices(translations, rotations, scales)
+
+    assert matrices.shape == (20, 4, 4)
+    for matrix, t, r, s in zip(matrices, translations, rotations, scales):
+        T = Translation.from_vector(t)
+        R = Rotation.from_euler_angles(r)
+        S = Scale.from_factors(s)
+        assert np.allclose(matrix, (T * R * S).matrix)
+
+
+def test_compose_matrices_identity():
+    matrices = compose_matrices([[0, 0, 0]], [[0, 0, 0]], [[1, 1, 1]])
+
+    assert np.allclose(matrices[0], np.identity(4))
+
+
+def test_pick():
+    width, height = 800, 600
+    for x, y, size in [(0, 0, 1), (400, 300, 1), (123, 456, 5), (799, 599, 65)]:
+        matrix = np.array(pick(x, y, width, height, size).matrix)
+        # the center of the pixel under the mouse, in normalized device coordinates
+        ndc = np.array([2 * (x + 0.5) / width - 1, 1 - 2 * (y + 0.5) / height, 0, 1])
+        assert np.allclose(matrix @ ndc, [0, 0, 0, 1])
+        # the center of the next pixel is one pixel of the pick region further
+        ndc[0] += 2 / width
+        assert np.allclose(matrix @ ndc, [2 / size, 0, 0, 1])